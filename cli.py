@@ -1,17 +1,58 @@
 """CLI Handler for VCS - Command pattern for user interaction."""
 
+import os
 import sys
-import argparse
 from typing import List
-from repository import Repository
 from pathlib import Path
 
+# Commands that need a loaded repository; dispatch resolves cmd_<name>
+_COMMANDS = frozenset({'add', 'commit', 'status', 'log', 'rollback',
+                       'branch', 'checkout', 'branches', 'merge', 'graph', 'audit'})
+
+# Parser registry: each ArgumentParser is built at most once per process
+_PARSERS = {}
+
+# Repositories already loaded by this process, keyed by path with the
+# .vcs directory mtime they were loaded (or last used) at; in-process
+# callers like the demo script dispatch many commands and skip the
+# state/graph/index re-parse when nothing changed on disk
+_REPO_CACHE = {}
+
+
+class CLIError(Exception):
+    """User-facing CLI failure; run() prints it instead of exiting.
+
+    Raising instead of sys.exit keeps in-process callers (demo script,
+    programmatic drivers) from tearing down the interpreter.
+    """
+
+
+def _get_parser(name: str):
+    """Return the cached ArgumentParser for a subcommand, building it once."""
+    parser = _PARSERS.get(name)
+    if parser is None:
+        import argparse
+        parser = argparse.ArgumentParser(prog=f'vcs {name}')
+        if name == 'commit':
+            parser.add_argument('-m', '--message', required=True, help='Commit message')
+            parser.add_argument('-a', '--author', default='default', help='Author')
+        elif name == 'log':
+            parser.add_argument('-n', '--number', type=int, help='Limit commits')
+        elif name == 'graph':
+            parser.add_argument('-o', '--output', help='Output file')
+            parser.add_argument('--format', choices=['png', 'dot'], default='png')
+        _PARSERS[name] = parser
+    return parser
+
 
 class CLIHandler:
     """CLI handler mapping user commands to Repository operations."""
-    
+
+    # Cached visualization entry point; False means dependencies missing
+    _visualize_fn = None
+
     def __init__(self):
-        self.repo: Repository = None
+        self.repo = None  # Repository, loaded lazily per command
         self.repo_path = Path.cwd()
     
     def run(self, args: List[str]):
@@ -30,35 +71,54 @@ class CLIHandler:
             self.print_help()
             return
         
-        # Load repository
-        self._load_repository()
-        
-        # Execute command
-        commands = {
-            'add': self.cmd_add, 'commit': self.cmd_commit, 'status': self.cmd_status,
-            'log': self.cmd_log, 'rollback': self.cmd_rollback, 'branch': self.cmd_branch,
-            'checkout': self.cmd_checkout, 'branches': self.cmd_branches,
-            'merge': self.cmd_merge, 'graph': self.cmd_graph, 'audit': self.cmd_audit
-        }
-        
-        if command in commands:
-            try:
-                commands[command](command_args)
-            except Exception as e:
-                print(f"Error: {e}")
-        else:
+        if command not in _COMMANDS:
             print(f"Unknown command: {command}. Use 'help' for available commands.")
+            return
+
+        # Load repository and dispatch without building a method table per call
+        try:
+            self._load_repository()
+            getattr(self, f"cmd_{command.replace('-', '_')}")(command_args)
+            # The in-memory repo reflects whatever the command just
+            # wrote, so record the new mtime instead of reloading later
+            self._remember_repository()
+        except CLIError as e:
+            print(f"Error: {e}")
+        except Exception as e:
+            print(f"Error: {e}")
+            if os.environ.get('VCS_DEBUG'):
+                import traceback
+                traceback.print_exc()
     
     def _load_repository(self):
-        """Load repository or exit."""
+        """Load repository (reusing a cached instance if current) or exit."""
+        from repository import Repository
         vcs_dir = self.repo_path / '.vcs'
         if not vcs_dir.exists():
-            print("Error: Not a VCS repository. Run 'vcs init' to initialize.")
-            sys.exit(1)
-        self.repo = Repository.load(str(self.repo_path))
-    
+            raise CLIError("Not a VCS repository. Run 'vcs init' to initialize.")
+
+        key = str(self.repo_path)
+        mtime = vcs_dir.stat().st_mtime_ns
+        cached = _REPO_CACHE.get(key)
+        if cached and cached[0] == mtime:
+            self.repo = cached[1]
+        else:
+            self.repo = Repository.load(key)
+            _REPO_CACHE[key] = [mtime, self.repo]
+
+    def _remember_repository(self):
+        """Refresh the cache entry after a command may have written state."""
+        if self.repo is None:
+            return
+        try:
+            mtime = (self.repo_path / '.vcs').stat().st_mtime_ns
+        except OSError:
+            return
+        _REPO_CACHE[str(self.repo_path)] = [mtime, self.repo]
+
     def cmd_init(self, args: List[str]):
         """Initialize repository."""
+        from repository import Repository
         self.repo = Repository(str(self.repo_path))
         print(self.repo.init())
     
@@ -67,16 +127,16 @@ class CLIHandler:
         if not args:
             print("Usage: vcs add <file> [<file2> ...]")
             return
-        for filepath in args:
-            print(self.repo.add(filepath))
-    
+        if len(args) == 1:
+            print(self.repo.add(args[0]))
+        else:
+            # One state write for the whole set instead of one per file
+            print(self.repo.add_files(args))
+
     def cmd_commit(self, args: List[str]):
         """Create commit."""
-        parser = argparse.ArgumentParser(prog='vcs commit')
-        parser.add_argument('-m', '--message', required=True, help='Commit message')
-        parser.add_argument('-a', '--author', default='default', help='Author')
         try:
-            parsed = parser.parse_args(args)
+            parsed = _get_parser('commit').parse_args(args)
             print(self.repo.commit(parsed.message, parsed.author))
         except SystemExit:
             pass
@@ -87,10 +147,8 @@ class CLIHandler:
     
     def cmd_log(self, args: List[str]):
         """Display history."""
-        parser = argparse.ArgumentParser(prog='vcs log')
-        parser.add_argument('-n', '--number', type=int, help='Limit commits')
         try:
-            parsed = parser.parse_args(args)
+            parsed = _get_parser('log').parse_args(args)
             print(self.repo.log(parsed.number))
         except SystemExit:
             pass
@@ -133,11 +191,8 @@ class CLIHandler:
     
     def cmd_graph(self, args: List[str]):
         """Visualize commit graph."""
-        parser = argparse.ArgumentParser(prog='vcs graph')
-        parser.add_argument('-o', '--output', help='Output file')
-        parser.add_argument('--format', choices=['png', 'dot'], default='png')
         try:
-            parsed = parser.parse_args(args)
+            parsed = _get_parser('graph').parse_args(args)
             
             if parsed.format == 'dot':
                 dot_content = self.repo.get_commit_graph_dot()
@@ -146,12 +201,23 @@ class CLIHandler:
                     f.write(dot_content)
                 print(f"Commit graph saved to {output_file}")
             else:
-                try:
-                    from visualization import visualize_commit_graph
+                if CLIHandler._visualize_fn is None:
+                    try:
+                        import visualization
+                        # The module itself imports fine without its
+                        # dependencies; only cache the entry point when
+                        # they actually loaded
+                        CLIHandler._visualize_fn = (
+                            visualization.visualize_commit_graph
+                            if visualization.VISUALIZATION_AVAILABLE else False)
+                    except ImportError:
+                        CLIHandler._visualize_fn = False
+
+                if CLIHandler._visualize_fn:
                     output_file = parsed.output or 'graph.png'
-                    visualize_commit_graph(self.repo, output_file)
+                    CLIHandler._visualize_fn(self.repo, output_file)
                     print(f"Commit graph saved to {output_file}")
-                except ImportError:
+                else:
                     print("Visualization unavailable. Install: pip install networkx matplotlib")
         except SystemExit:
             pass
